@@ -15,12 +15,16 @@ from flask import Flask, jsonify, render_template_string
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-app = Flask(__name__)
-
 # Node configuration (loaded from hosts.json generated by Ansible)
 # Fallback to hardcoded list if file not found
 HOSTS_JSON_PATH = os.environ.get('HOSTS_JSON_PATH', '/app/hosts.json')
 
+# Status values that count a node as healthy when aggregating
+HEALTHY_HEALTH_STATUSES = frozenset({"healthy", "UP"})
+HEALTHY_API_STATUSES = frozenset({"running", "healthy"})
+# (health_status, api_status) of status-only nodes, which are excluded from aggregation
+STATUS_ONLY = ("n/a", "n/a")
+
 def load_nodes():
     """Load node configuration from hosts.json or use fallback."""
     try:
@@ -202,7 +206,6 @@ async def get_all_nodes_status():
         tasks = [fetch_node_status(session, node) for node in NODES]
         return await asyncio.gather(*tasks)
 
-@app.route('/')
 def root():
     """Root endpoint - shows dashboard (primary use case for status page)."""
     # For status container, root endpoint shows the dashboard
@@ -210,7 +213,6 @@ def root():
     # JSON service info is available via /api/status endpoint
     return dashboard()
 
-@app.route('/health')
 def health():
     """Health check endpoint - compatible with base container."""
     return jsonify({
@@ -219,7 +221,6 @@ def health():
         "version": CONTAINER_VERSION
     })
 
-@app.route('/api/health')
 def api_health():
     """API health check endpoint - compatible with base container."""
     return jsonify({
@@ -228,7 +229,6 @@ def api_health():
         "version": CONTAINER_VERSION
     })
 
-@app.route('/api/status')
 def api_status():
     """API endpoint to get aggregated status of all nodes."""
     # Run the async function in a new event loop
@@ -243,11 +243,11 @@ def api_status():
     healthy_nodes = 0
     for node in nodes_status:
         # Skip status-only nodes (gnode1) from health calculations
-        if node["health_status"] == "n/a" and node["api_status"] == "n/a":
+        if (node["health_status"], node["api_status"]) == STATUS_ONLY:
             continue
         # Check if node is healthy
-        health_ok = node["health_status"] in ["healthy", "UP"]
-        api_ok = node["api_status"] in ["running", "healthy"]
+        health_ok = node["health_status"] in HEALTHY_HEALTH_STATUSES
+        api_ok = node["api_status"] in HEALTHY_API_STATUSES
         if health_ok and api_ok:
             healthy_nodes += 1
         else:
@@ -263,7 +263,6 @@ def api_status():
         "nodes": nodes_status
     })
 
-@app.route('/dashboard')
 def dashboard():
     """Web dashboard to display aggregated status of all nodes in a table format."""
     # Run the async function in a new event loop
@@ -275,8 +274,11 @@ def dashboard():
         loop.close()
     
     # Calculate overall status (exclude status-only nodes from calculations)
-    checkable_nodes = [n for n in nodes_status if not (n["health_status"] == "n/a" and n["api_status"] == "n/a")]
-    healthy_nodes = sum(1 for node in checkable_nodes if node["health_status"] in ["healthy", "UP"] and node["api_status"] in ["running", "healthy"])
+    checkable_nodes = [n for n in nodes_status if (n["health_status"], n["api_status"]) != STATUS_ONLY]
+    healthy_nodes = sum(
+        1 for node in checkable_nodes
+        if node["health_status"] in HEALTHY_HEALTH_STATUSES and node["api_status"] in HEALTHY_API_STATUSES
+    )
     total_nodes = len(checkable_nodes)
     overall_status = "healthy" if healthy_nodes == total_nodes and total_nodes > 0 else "degraded" if healthy_nodes > 0 else "down"
     
@@ -521,6 +523,18 @@ def dashboard():
     
     return html
 
+def create_app():
+    """Create the status dashboard Flask application with all routes registered."""
+    flask_app = Flask(__name__)
+    flask_app.add_url_rule('/', view_func=root)
+    flask_app.add_url_rule('/health', view_func=health)
+    flask_app.add_url_rule('/api/health', view_func=api_health)
+    flask_app.add_url_rule('/api/status', view_func=api_status)
+    flask_app.add_url_rule('/dashboard', view_func=dashboard)
+    return flask_app
+
+app = create_app()
+
 def main():
     """Main entry point for status container."""
     port = int(os.environ.get('PORT', 8080))
@@ -4,83 +4,171 @@ This module discovers AWS infrastructure resources and prepares data
 for Terraform configuration generation.
 """
 
-import json
+import gzip
 import logging
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from functools import lru_cache, partial, wraps
+from operator import itemgetter
 from typing import Any, Dict, List, Optional
 
 import boto3
+import orjson
+from botocore.config import Config
 from botocore.exceptions import ClientError
 
 logger = logging.getLogger(__name__)
 
+_KEY_VALUE = itemgetter("Key", "Value")
+
+# Discovery worker threads; every one of them may share the EC2 client at once
+_MAX_WORKERS = 16
+
+# Adaptive retries back off client-side when AWS throttles the concurrent describe calls, and the
+# connection pool is sized so worker threads sharing a client never queue for a connection
+_CLIENT_CONFIG = Config(
+    retries={"mode": "adaptive", "max_attempts": 10},
+    max_pool_connections=_MAX_WORKERS,
+    tcp_keepalive=True,
+)
+
+# One writer thread, so overlapping saves never race on the output directory
+_SAVE_POOL = ThreadPoolExecutor(max_workers=1, thread_name_prefix="discovery-save")
+
+_HOSTED_ZONE_PREFIX = "/hostedzone/"
+
+# NS and SOA records are managed by the hosted zone itself
+_SKIP_RECORD_TYPES = frozenset({"NS", "SOA"})
+
+
+@lru_cache(maxsize=None)
+def _make_client(service: str, region: str):
+    """Create a boto3 client once per (service, region) and reuse it across instances."""
+    return boto3.client(service, region_name=region, config=_CLIENT_CONFIG)
+
+
+def _tags_to_dict(tags: List[Dict[str, str]]) -> Dict[str, str]:
+    """Turn an AWS [{"Key": ..., "Value": ...}] tag list into a plain dict."""
+    return dict(map(_KEY_VALUE, tags))
+
+
+def _log_save_failure(future: Future):
+    """Log an exception raised by a background save, so it is not lost when wait_save() is never called."""
+    if not future.cancelled() and future.exception() is not None:
+        logger.error(f"Error saving discovery results: {future.exception()}")
+
+
+def _ttl_cached(method):
+    """Skip a discover_<key> call when <key> was discovered less than cache_ttl seconds ago."""
+    resource_key = method.__name__[len("discover_") :]
+
+    @wraps(method)
+    def wrapper(self):
+        fetched_at = self._fetched_at.get(resource_key)
+        if fetched_at is not None and time.monotonic() - fetched_at < self.cache_ttl:
+            return
+        previous = self.discovered_resources.get(resource_key)
+        method(self)
+        # Only a successful call stores a new list; failures leave the entry untouched
+        if self.discovered_resources.get(resource_key) is not previous:
+            self._fetched_at[resource_key] = time.monotonic()
+
+    return wrapper
+
 
 class TerraformDiscovery:
     """Discovers AWS infrastructure and prepares data for Terraform generation."""
 
-    def __init__(self, region: str = "us-east-1"):
+    def __init__(self, region: str = "us-east-1", cache_ttl: float = 60, compress: bool = False):
         """
         Initialize Terraform discovery client.
 
         Args:
             region: AWS region to discover resources in
+            cache_ttl: Seconds a discovered resource type is reused before it is fetched again
+            compress: Gzip the saved discovery results
         """
         self.region = region
-        self.session = boto3.Session()
+        self.cache_ttl = cache_ttl
+        self.compress = compress
         self.discovered_resources: Dict[str, List[Dict[str, Any]]] = {}
+        self._fetched_at: Dict[str, float] = {}
+        self._save_future: Optional[Future] = None
 
-        # Initialize AWS service clients
+        # Initialize AWS service clients. They are built here rather than lazily so that client
+        # construction never happens inside the discovery worker threads.
         self.clients = {
-            "ec2": boto3.client("ec2", region_name=region),
-            "r53": boto3.client("route53", region_name=region),
-            "s3": boto3.client("s3", region_name=region),
-            "vpc": boto3.client("ec2", region_name=region),  # VPC is part of EC2
-            "iam": boto3.client("iam", region_name=region),
-            "cloudwatch": boto3.client("cloudwatch", region_name=region),
+            "ec2": _make_client("ec2", region),
+            "r53": _make_client("route53", region),
+            "s3": _make_client("s3", region),
+            "vpc": _make_client("ec2", region),  # VPC is part of EC2
+            "iam": _make_client("iam", region),
+            "cloudwatch": _make_client("cloudwatch", region),
+            "tagging": _make_client("resourcegroupstaggingapi", region),
         }
 
     def discover_all_resources(self) -> Dict[str, List[Dict[str, Any]]]:
         """
         Discover all AWS resources in the account.
 
+        The results file is written in the background, so it may not exist yet when this returns;
+        call wait_save() to block until it does and to re-raise any error from the save.
+
         Returns:
             Dictionary of discovered resources by service
         """
         logger.info("Starting AWS infrastructure discovery...")
 
-        # Discover resources by service
-        self.discover_ec2_instances()
-        self.discover_vpcs()
-        self.discover_subnets()
-        self.discover_security_groups()
-        self.discover_route_tables()
-        self.discover_internet_gateways()
-        self.discover_nat_gateways()
-        self.discover_elastic_ips()
-        self.discover_volumes()
-        self.discover_snapshots()
-        self.discover_route53_zones()
+        # Discover resources by service. The calls are independent and I/O bound, so run them
+        # concurrently; each method assigns its own key in a single statement.
+        tasks = [
+            self.discover_ec2_instances,
+            self.discover_vpcs,
+            self.discover_subnets,
+            self.discover_security_groups,
+            self.discover_route_tables,
+            self.discover_internet_gateways,
+            self.discover_nat_gateways,
+            self.discover_elastic_ips,
+            self.discover_volumes,
+            self.discover_snapshots,
+            self.discover_route53_zones,
+            self.discover_s3_buckets,
+            self.discover_iam_roles,
+            self.discover_iam_policies,
+        ]
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(tasks))) as executor:
+            futures = {executor.submit(task): task.__name__ for task in tasks}
+            for future in as_completed(futures):
+                # Anything other than an API error (missing credentials, no endpoint, bugs) aborts discovery
+                try:
+                    future.result()
+                except ClientError as e:
+                    logger.error(f"Error in {futures[future]}: {e}")
+
+        # Route53 records depend on the discovered zones
         self.discover_route53_records()
-        self.discover_s3_buckets()
-        self.discover_iam_roles()
-        self.discover_iam_policies()
 
-        # Save discovery results
-        self._save_discovery_results()
+        # Save discovery results in the background; failures are logged even if nobody calls wait_save()
+        self._save_future = _SAVE_POOL.submit(self._save_discovery_results)
+        self._save_future.add_done_callback(_log_save_failure)
 
         logger.info(
             f"Discovery complete. Found {sum(len(resources) for resources in self.discovered_resources.values())} resources"
         )
         return self.discovered_resources
 
+    @_ttl_cached
     def discover_ec2_instances(self):
         """Discover EC2 instances."""
         try:
-            response = self.clients["ec2"].describe_instances()
             instances = []
 
-            for reservation in response.get("Reservations", []):
+            # Let EC2 drop terminated instances server-side; the state check below is kept as a safeguard
+            live_states = {"Name": "instance-state-name", "Values": ["pending", "running", "stopping", "stopped"]}
+            for reservation in self._paginate("ec2", "describe_instances", "Reservations", Filters=[live_states]):
                 for instance in reservation.get("Instances", []):
                     if instance["State"]["Name"] not in ["terminated", "shutting-down"]:
                         instances.append(
@@ -88,7 +176,7 @@ class TerraformDiscovery:
                                 "type": "aws_instance",
                                 "id": instance["InstanceId"],
                                 "data": instance,
-                                "tags": {tag["Key"]: tag["Value"] for tag in instance.get("Tags", [])},
+                                "tags": _tags_to_dict(instance.get("Tags", [])),
                             }
                         )
 
@@ -98,19 +186,19 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering EC2 instances: {e}")
 
+    @_ttl_cached
     def discover_vpcs(self):
         """Discover VPCs."""
         try:
-            response = self.clients["vpc"].describe_vpcs()
             vpcs = []
 
-            for vpc in response.get("Vpcs", []):
+            for vpc in self._paginate("vpc", "describe_vpcs", "Vpcs"):
                 vpcs.append(
                     {
                         "type": "aws_vpc",
                         "id": vpc["VpcId"],
                         "data": vpc,
-                        "tags": {tag["Key"]: tag["Value"] for tag in vpc.get("Tags", [])},
+                        "tags": _tags_to_dict(vpc.get("Tags", [])),
                     }
                 )
 
@@ -120,19 +208,19 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering VPCs: {e}")
 
+    @_ttl_cached
     def discover_subnets(self):
         """Discover subnets."""
         try:
-            response = self.clients["vpc"].describe_subnets()
             subnets = []
 
-            for subnet in response.get("Subnets", []):
+            for subnet in self._paginate("vpc", "describe_subnets", "Subnets"):
                 subnets.append(
                     {
                         "type": "aws_subnet",
                         "id": subnet["SubnetId"],
                         "data": subnet,
-                        "tags": {tag["Key"]: tag["Value"] for tag in subnet.get("Tags", [])},
+                        "tags": _tags_to_dict(subnet.get("Tags", [])),
                     }
                 )
 
@@ -142,19 +230,19 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering subnets: {e}")
 
+    @_ttl_cached
     def discover_security_groups(self):
         """Discover security groups."""
         try:
-            response = self.clients["vpc"].describe_security_groups()
             security_groups = []
 
-            for sg in response.get("SecurityGroups", []):
+            for sg in self._paginate("vpc", "describe_security_groups", "SecurityGroups"):
                 security_groups.append(
                     {
                         "type": "aws_security_group",
                         "id": sg["GroupId"],
                         "data": sg,
-                        "tags": {tag["Key"]: tag["Value"] for tag in sg.get("Tags", [])},
+                        "tags": _tags_to_dict(sg.get("Tags", [])),
                     }
                 )
 
@@ -164,19 +252,19 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering security groups: {e}")
 
+    @_ttl_cached
     def discover_route_tables(self):
         """Discover route tables."""
         try:
-            response = self.clients["vpc"].describe_route_tables()
             route_tables = []
 
-            for rt in response.get("RouteTables", []):
+            for rt in self._paginate("vpc", "describe_route_tables", "RouteTables"):
                 route_tables.append(
                     {
                         "type": "aws_route_table",
                         "id": rt["RouteTableId"],
                         "data": rt,
-                        "tags": {tag["Key"]: tag["Value"] for tag in rt.get("Tags", [])},
+                        "tags": _tags_to_dict(rt.get("Tags", [])),
                     }
                 )
 
@@ -186,19 +274,19 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering route tables: {e}")
 
+    @_ttl_cached
     def discover_internet_gateways(self):
         """Discover internet gateways."""
         try:
-            response = self.clients["vpc"].describe_internet_gateways()
             igws = []
 
-            for igw in response.get("InternetGateways", []):
+            for igw in self._paginate("vpc", "describe_internet_gateways", "InternetGateways"):
                 igws.append(
                     {
                         "type": "aws_internet_gateway",
                         "id": igw["InternetGatewayId"],
                         "data": igw,
-                        "tags": {tag["Key"]: tag["Value"] for tag in igw.get("Tags", [])},
+                        "tags": _tags_to_dict(igw.get("Tags", [])),
                     }
                 )
 
@@ -208,20 +296,20 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering internet gateways: {e}")
 
+    @_ttl_cached
     def discover_nat_gateways(self):
         """Discover NAT gateways."""
         try:
-            response = self.clients["vpc"].describe_nat_gateways()
             nat_gateways = []
 
-            for ngw in response.get("NatGateways", []):
+            for ngw in self._paginate("vpc", "describe_nat_gateways", "NatGateways"):
                 if ngw["State"] not in ["deleted", "deleting"]:
                     nat_gateways.append(
                         {
                             "type": "aws_nat_gateway",
                             "id": ngw["NatGatewayId"],
                             "data": ngw,
-                            "tags": {tag["Key"]: tag["Value"] for tag in ngw.get("Tags", [])},
+                            "tags": _tags_to_dict(ngw.get("Tags", [])),
                         }
                     )
 
@@ -231,6 +319,7 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering NAT gateways: {e}")
 
+    @_ttl_cached
     def discover_elastic_ips(self):
         """Discover Elastic IPs."""
         try:
@@ -243,7 +332,7 @@ class TerraformDiscovery:
                         "type": "aws_eip",
                         "id": eip["AllocationId"] if "AllocationId" in eip else eip["PublicIp"],
                         "data": eip,
-                        "tags": {tag["Key"]: tag["Value"] for tag in eip.get("Tags", [])},
+                        "tags": _tags_to_dict(eip.get("Tags", [])),
                     }
                 )
 
@@ -253,20 +342,20 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering Elastic IPs: {e}")
 
+    @_ttl_cached
     def discover_volumes(self):
         """Discover EBS volumes."""
         try:
-            response = self.clients["ec2"].describe_volumes()
             volumes = []
 
-            for volume in response.get("Volumes", []):
+            for volume in self._paginate("ec2", "describe_volumes", "Volumes"):
                 if volume["State"] not in ["deleted", "deleting"]:
                     volumes.append(
                         {
                             "type": "aws_ebs_volume",
                             "id": volume["VolumeId"],
                             "data": volume,
-                            "tags": {tag["Key"]: tag["Value"] for tag in volume.get("Tags", [])},
+                            "tags": _tags_to_dict(volume.get("Tags", [])),
                         }
                     )
 
@@ -276,21 +365,21 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering EBS volumes: {e}")
 
+    @_ttl_cached
     def discover_snapshots(self):
         """Discover EBS snapshots."""
         try:
             # Only get snapshots owned by the current account
-            response = self.clients["ec2"].describe_snapshots(OwnerIds=["self"])
             snapshots = []
 
-            for snapshot in response.get("Snapshots", []):
+            for snapshot in self._paginate("ec2", "describe_snapshots", "Snapshots", OwnerIds=["self"]):
                 if snapshot["State"] not in ["deleted", "deleting"]:
                     snapshots.append(
                         {
                             "type": "aws_ebs_snapshot",
                             "id": snapshot["SnapshotId"],
                             "data": snapshot,
-                            "tags": {tag["Key"]: tag["Value"] for tag in snapshot.get("Tags", [])},
+                            "tags": _tags_to_dict(snapshot.get("Tags", [])),
                         }
                     )
 
@@ -300,17 +389,17 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering EBS snapshots: {e}")
 
+    @_ttl_cached
     def discover_route53_zones(self):
         """Discover Route 53 hosted zones."""
         try:
-            response = self.clients["r53"].list_hosted_zones()
             zones = []
 
-            for zone in response.get("HostedZones", []):
+            for zone in self._paginate("r53", "list_hosted_zones", "HostedZones"):
                 zones.append(
                     {
                         "type": "aws_route53_zone",
-                        "id": zone["Id"].split("/")[-1],  # Remove /hostedzone/ prefix
+                        "id": zone["Id"].removeprefix(_HOSTED_ZONE_PREFIX),
                         "data": zone,
                         "tags": {},  # Route53 zones don't have tags in list response
                     }
@@ -322,6 +411,7 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering Route 53 zones: {e}")
 
+    @_ttl_cached
     def discover_route53_records(self):
         """Discover Route 53 records."""
         try:
@@ -330,11 +420,11 @@ class TerraformDiscovery:
             # Get records for each hosted zone
             for zone in self.discovered_resources.get("route53_zones", []):
                 zone_id = zone["data"]["Id"]
-                response = self.clients["r53"].list_resource_record_sets(HostedZoneId=zone_id)
 
-                for record in response.get("ResourceRecordSets", []):
-                    # Skip NS and SOA records as they're managed by the zone
-                    if record["Type"] not in ["NS", "SOA"]:
+                for record in self._paginate(
+                    "r53", "list_resource_record_sets", "ResourceRecordSets", HostedZoneId=zone_id
+                ):
+                    if record["Type"] not in _SKIP_RECORD_TYPES:
                         records.append(
                             {
                                 "type": "aws_route53_record",
@@ -351,13 +441,13 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering Route 53 records: {e}")
 
+    @_ttl_cached
     def discover_s3_buckets(self):
         """Discover S3 buckets."""
         try:
-            response = self.clients["s3"].list_buckets()
             buckets = []
 
-            for bucket in response.get("Buckets", []):
+            for bucket in self._paginate("s3", "list_buckets", "Buckets"):
                 buckets.append(
                     {
                         "type": "aws_s3_bucket",
@@ -373,19 +463,19 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering S3 buckets: {e}")
 
+    @_ttl_cached
     def discover_iam_roles(self):
         """Discover IAM roles."""
         try:
-            response = self.clients["iam"].list_roles()
             roles = []
 
-            for role in response.get("Roles", []):
+            for role in self._paginate("iam", "list_roles", "Roles"):
                 roles.append(
                     {
                         "type": "aws_iam_role",
                         "id": role["RoleName"],
                         "data": role,
-                        "tags": {tag["Key"]: tag["Value"] for tag in role.get("Tags", [])},
+                        "tags": _tags_to_dict(role.get("Tags", [])),
                     }
                 )
 
@@ -395,19 +485,19 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering IAM roles: {e}")
 
+    @_ttl_cached
     def discover_iam_policies(self):
         """Discover IAM policies."""
         try:
-            response = self.clients["iam"].list_policies(Scope="Local")
             policies = []
 
-            for policy in response.get("Policies", []):
+            for policy in self._paginate("iam", "list_policies", "Policies", Scope="Local"):
                 policies.append(
                     {
                         "type": "aws_iam_policy",
                         "id": policy["PolicyName"],
                         "data": policy,
-                        "tags": {tag["Key"]: tag["Value"] for tag in policy.get("Tags", [])},
+                        "tags": _tags_to_dict(policy.get("Tags", [])),
                     }
                 )
 
@@ -417,16 +507,79 @@ class TerraformDiscovery:
         except ClientError as e:
             logger.error(f"Error discovering IAM policies: {e}")
 
+    def discover_by_tags(
+        self, tag_filters: List[Dict[str, Any]], resource_types: Optional[List[str]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Discover only the resources matching the given tags via the Resource Groups Tagging API.
+
+        Args:
+            tag_filters: TagFilters, e.g. [{"Key": "Environment", "Values": ["production"]}]
+            resource_types: ResourceTypeFilters, e.g. ["ec2:instance", "s3"]; all types when omitted
+
+        Returns:
+            List of tagged resources keyed by ARN
+        """
+        tagged = []
+        try:
+            for mapping in self._paginate(
+                "tagging",
+                "get_resources",
+                "ResourceTagMappingList",
+                TagFilters=tag_filters,
+                ResourceTypeFilters=resource_types or [],
+            ):
+                # arn:partition:service:region:account:resource-type/resource-id (S3 has no resource type)
+                arn = mapping["ResourceARN"]
+                _, _, service, _, _, resource = arn.split(":", 5)
+                resource_type, sep, _ = resource.replace(":", "/", 1).partition("/")
+                tagged.append(
+                    {
+                        "type": f"{service}:{resource_type}" if sep else service,
+                        "id": arn,
+                        "data": mapping,
+                        "tags": _tags_to_dict(mapping.get("Tags", [])),
+                    }
+                )
+
+            self.discovered_resources["tagged_resources"] = tagged
+            logger.info(f"Discovered {len(tagged)} tagged resources")
+
+        except ClientError as e:
+            logger.error(f"Error discovering tagged resources: {e}")
+
+        return tagged
+
+    def wait_save(self):
+        """Block until the background save started by discover_all_resources has finished, re-raising its error."""
+        if self._save_future is not None:
+            self._save_future.result()
+
+    def invalidate_cache(self):
+        """Forget discovery timestamps so the next discover_* calls query AWS again."""
+        self._fetched_at.clear()
+
+    def _paginate(self, client: str, operation: str, result_key: str, **kwargs):
+        """Yield every item under result_key across all pages of a paginated AWS operation."""
+        for page in self.clients[client].get_paginator(operation).paginate(**kwargs):
+            yield from page.get(result_key, [])
+
     def _save_discovery_results(self):
         """Save discovery results to JSON file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         filename = f"terraform_output/discovered_resources_{timestamp}.json"
+        if self.compress:
+            filename += ".gz"
 
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(filename), exist_ok=True)
 
-        with open(filename, "w") as f:
-            json.dump(self.discovered_resources, f, indent=2, default=str)
+        # Repeated keys make the dumps compress ~10x even at the cheapest level
+        opener = partial(gzip.open, compresslevel=1) if self.compress else open
+
+        # orjson serializes the datetimes in boto3 responses natively; default=str covers anything else
+        with opener(filename, "wb") as f:
+            f.write(orjson.dumps(self.discovered_resources, option=orjson.OPT_INDENT_2, default=str))
 
         logger.info(f"Discovery results saved to {filename}")
 
@@ -457,6 +610,8 @@ def main():
     logger.info(f"{'Total Resources':<30} {total_resources:>6}")
     logger.info("=" * 60)
 
+    discovery.wait_save()
+
 
 if __name__ == "__main__":
     main()
@@ -3,6 +3,7 @@
 This module generates Terraform configurations from discovered AWS resources.
 """
 
+import gzip
 import json
 import logging
 import os
@@ -49,7 +50,9 @@ class TerraformGenerator:
             return {}
 
         discovery_files = [
-            f for f in os.listdir(terraform_output_dir) if f.startswith("discovered_resources_") and f.endswith(".json")
+            f
+            for f in os.listdir(terraform_output_dir)
+            if f.startswith("discovered_resources_") and f.endswith((".json", ".json.gz"))
         ]
 
         if not discovery_files:
@@ -62,7 +65,8 @@ class TerraformGenerator:
 
         for file in discovery_files:
             filepath = os.path.join(terraform_output_dir, file)
-            with open(filepath, "r") as f:
+            opener = gzip.open if file.endswith(".gz") else open
+            with opener(filepath, "rt") as f:
                 resources = json.load(f)
 
                 # Determine region from the resources (look for region-specific identifiers)
@@ -187,7 +187,7 @@ print_status "5. TESTING"
 echo "=========================================="
 
 # Run tests with coverage
-if ! run_check "Pytest with coverage" "poetry run pytest --cov=src --cov-report=xml --cov-report=html --cov-report=term-missing"; then
+if ! run_check "Pytest with coverage" "poetry run pytest -n auto --dist loadgroup --cov=src --cov-report=xml --cov-report=html --cov-report=term-missing"; then
     print_error "Tests failed. Review output above."
     overall_success=false
 fi
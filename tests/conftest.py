@@ -0,0 +1,119 @@
+"""Shared pytest fixtures for the clint test suite."""
+
+import os
+import re
+from unittest.mock import Mock, mock_open, patch
+
+import pytest
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+_MOCK_OPEN = mock_open()
+
+_MOCK_HOSTS_DATA = {
+    "groups": {
+        "webapp_hosts": [
+            {
+                "name": "onode1",
+                "host": "192.9.154.97",
+                "provider": "oracle",
+                "role": "api_server",
+            },
+            {
+                "name": "gnode1",
+                "host": "35.233.161.8",
+                "provider": "google",
+                "role": "status",
+            },
+        ],
+        "status_container_hosts": [{"name": "gnode1"}],
+    }
+}
+
+
+def pytest_configure(config):
+    """Root pytest temp dirs on tmpfs when the host has one, so report writes stay in RAM."""
+    if os.path.isdir("/dev/shm") and "PYTEST_DEBUG_TEMPROOT" not in os.environ:
+        os.environ["PYTEST_DEBUG_TEMPROOT"] = "/dev/shm"
+
+
+def pytest_collection_modifyitems(config, items):
+    """Skip live network tests unless the -m expression names the live marker."""
+    # "-m 'not live'" also names it, but that expression deselects the live tests anyway
+    if re.search(r"\blive\b", config.getoption("markexpr")):
+        return
+    skip_live = pytest.mark.skip(reason="live network test; select with -m live")
+    for item in items:
+        if "live" in item.keywords:
+            item.add_marker(skip_live)
+
+
+@pytest.fixture
+def mock_client():
+    """Mock Cost Explorer boto3 client."""
+    return Mock()
+
+
+@pytest.fixture
+def mock_sts_client():
+    """Mock STS boto3 client."""
+    return Mock()
+
+
+@pytest.fixture
+def mock_session(mock_client, mock_sts_client):
+    """Patch boto3.Session so it hands out the mock ce and sts clients in order."""
+    with patch("boto3.Session") as mock_session:
+        mock_session.return_value.client.side_effect = [
+            mock_client,
+            mock_sts_client,
+        ]
+        yield mock_session
+
+
+@pytest.fixture
+def ce_client(mock_session):
+    """CostExplorerClient backed by the mock session."""
+    from clint.aws.cost_explorer import CostExplorerClient
+
+    return CostExplorerClient()
+
+
+@pytest.fixture
+def app_inst():
+    """Fresh status container app per test so no Flask state leaks between tests."""
+    from clint.container.status import create_app
+
+    return create_app()
+
+
+@pytest.fixture
+def flask_client(app_inst):
+    """Flask test client for the status container app."""
+    with app_inst.test_client() as client:
+        yield client
+
+
+@pytest.fixture(scope="session")
+def mock_hosts_data():
+    """Sample hosts.json content with one API node and one status-only node."""
+    return _MOCK_HOSTS_DATA
+
+
+@pytest.fixture
+def patched_open(monkeypatch):
+    """Patch builtins.open with a shared mock_open, reset after each test."""
+    monkeypatch.setattr("builtins.open", _MOCK_OPEN)
+    yield _MOCK_OPEN
+    _MOCK_OPEN.reset_mock()
+
+
+@pytest.fixture(scope="session")
+def http():
+    """One requests.Session shared by the whole run, retrying a failed connection once."""
+    with requests.Session() as session:
+        adapter = HTTPAdapter(max_retries=Retry(total=1, backoff_factor=0))
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        yield session
@@ -7,7 +7,6 @@ without requiring AWS credentials.
 
 import os
 import shutil
-import sys
 import tempfile
 
 import pytest
@@ -1,15 +1,54 @@
 """Tests for the ReportGenerator module."""
 
+import datetime as dt
 import os
-import shutil
-import sys
-import tempfile
 from unittest.mock import patch
 
 import pytest
+import time_machine
 
 from clint.reports.generator import ReportGenerator
 
+FROZEN_NOW = dt.datetime(2023, 1, 1, 12, 0, 0, tzinfo=dt.timezone.utc)
+
+_SUMMARY_BASIC = {
+    "total_cost": 150.0,
+    "service_count": 3,
+    "top_services": [
+        {"service": "Amazon EC2", "cost": 100.0, "percentage": 66.7},
+        {"service": "Amazon S3", "cost": 30.0, "percentage": 20.0},
+        {"service": "Amazon RDS", "cost": 20.0, "percentage": 13.3},
+    ],
+}
+
+_SERVICES_BASIC = [
+    {"service": "Amazon EC2", "cost": 100.0},
+    {"service": "Amazon S3", "cost": 30.0},
+    {"service": "Amazon RDS", "cost": 20.0},
+]
+
+_SUMMARY_EMPTY = {"total_cost": 0.0, "service_count": 0, "top_services": []}
+
+_SUMMARY_TEMPLATE = {
+    "total_cost": 75.5,
+    "service_count": 2,
+    "top_services": [
+        {"service": "Amazon EC2", "cost": 50.0, "percentage": 66.2},
+        {"service": "Amazon S3", "cost": 25.5, "percentage": 33.8},
+    ],
+}
+
+_SERVICES_TEMPLATE = [
+    {"service": "Amazon EC2", "cost": 50.0},
+    {"service": "Amazon S3", "cost": 25.5},
+]
+
+
+@pytest.fixture
+def gen(tmp_path):
+    """A ReportGenerator writing into a fresh directory, so each test only sees the report it generated."""
+    return ReportGenerator(str(tmp_path)), tmp_path
+
 
 class TestReportGenerator:
     """Test cases for ReportGenerator."""
@@ -30,234 +69,153 @@ class TestReportGenerator:
             assert generator.output_dir == "custom_reports"
             mock_makedirs.assert_called_once_with("custom_reports", exist_ok=True)
 
-    def test_generate_html_report_success(self):
+    def test_generate_html_report_success(self, gen):
         """Test successful HTML report generation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            generator = ReportGenerator(temp_dir)
-
-            summary = {
-                "total_cost": 150.0,
-                "service_count": 3,
-                "top_services": [
-                    {"service": "Amazon EC2", "cost": 100.0, "percentage": 66.7},
-                    {"service": "Amazon S3", "cost": 30.0, "percentage": 20.0},
-                    {"service": "Amazon RDS", "cost": 20.0, "percentage": 13.3},
-                ],
-            }
-
-            services = [
-                {"service": "Amazon EC2", "cost": 100.0},
-                {"service": "Amazon S3", "cost": 30.0},
-                {"service": "Amazon RDS", "cost": 20.0},
-            ]
-
-            with patch("clint.reports.generator.datetime") as mock_datetime:
-                mock_datetime.now.return_value.strftime.side_effect = [
-                    "2023-01-01 12:00:00 UTC",  # For generated_at
-                    "20230101_120000",  # For filename timestamp
-                ]
-
-                result = generator.generate_html_report(
-                    title="Test Report",
-                    summary=summary,
-                    services=services,
-                    days_back=30,
-                    account_id="****-****-1234",
-                )
-
-                # Check that files were created
-                assert os.path.exists(result)
-
-                # Check file content
-                with open(result, "r") as f:
-                    content = f.read()
-                    assert "Test Report" in content
-                    assert "$150.00" in content
-                    assert "Amazon EC2" in content
-                    assert "****-****-1234" in content
-                    assert "Privacy Notice" in content
-
-    def test_generate_html_report_no_services(self):
+        generator, _ = gen
+
+        with time_machine.travel(FROZEN_NOW, tick=False):
+            result = generator.generate_html_report(
+                title="Test Report",
+                summary=_SUMMARY_BASIC,
+                services=_SERVICES_BASIC,
+                days_back=30,
+                account_id="****-****-1234",
+            )
+
+            # Check that files were created
+            assert os.path.exists(result)
+
+            # Check file content
+            with open(result, "r") as f:
+                content = f.read()
+            expected = ("Test Report", "$150.00", "Amazon EC2", "****-****-1234", "Privacy Notice")
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
+
+    def test_generate_html_report_no_services(self, gen):
         """Test HTML report generation with no services."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            generator = ReportGenerator(temp_dir)
-
-            summary = {"total_cost": 0.0, "service_count": 0, "top_services": []}
-
-            with patch("clint.reports.generator.datetime") as mock_datetime:
-                mock_datetime.now.return_value.strftime.side_effect = [
-                    "2023-01-01 12:00:00 UTC",
-                    "20230101_120000",
-                ]
-
-                result = generator.generate_html_report(
-                    title="Empty Report",
-                    summary=summary,
-                    services=[],
-                    days_back=7,
-                    account_id=None,
-                )
-
-                # Check that files were created
-                assert os.path.exists(result)
-
-                # Check file content
-                with open(result, "r") as f:
-                    content = f.read()
-                    assert "Empty Report" in content
-                    assert "$0.00" in content
-                    # Template doesn't show "No service data available" when services list is empty
-                    # It just omits the services section entirely
-
-    def test_generate_html_report_without_account_id(self):
+        generator, _ = gen
+
+        with time_machine.travel(FROZEN_NOW, tick=False):
+            result = generator.generate_html_report(
+                title="Empty Report",
+                summary=_SUMMARY_EMPTY,
+                services=[],
+                days_back=7,
+                account_id=None,
+            )
+
+            # Check that files were created
+            assert os.path.exists(result)
+
+            # Check file content
+            with open(result, "r") as f:
+                content = f.read()
+            # Template doesn't show "No service data available" when services list is empty
+            # It just omits the services section entirely
+            expected = ("Empty Report", "$0.00")
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
+
+    def test_generate_html_report_without_account_id(self, gen):
         """Test HTML report generation without account ID."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            generator = ReportGenerator(temp_dir)
-
-            summary = {
-                "total_cost": 50.0,
-                "service_count": 1,
-                "top_services": [{"service": "Amazon EC2", "cost": 50.0, "percentage": 100.0}],
-            }
-
-            with patch("clint.reports.generator.datetime") as mock_datetime:
-                mock_datetime.now.return_value.strftime.side_effect = [
-                    "2023-01-01 12:00:00 UTC",
-                    "20230101_120000",
-                ]
-
-                result = generator.generate_html_report(
-                    title="Test Report",
-                    summary=summary,
-                    services=[{"service": "Amazon EC2", "cost": 50.0}],
-                    days_back=14,
-                    account_id=None,
-                )
-
-                # Check file content doesn't include account ID
-                with open(result, "r") as f:
-                    content = f.read()
-                    assert "Account:" not in content
-
-    def test_generate_html_report_creates_timestamped_file(self):
+        generator, _ = gen
+
+        with time_machine.travel(FROZEN_NOW, tick=False):
+            result = generator.generate_html_report(
+                title="Test Report",
+                summary=_SUMMARY_BASIC,
+                services=_SERVICES_BASIC,
+                days_back=14,
+                account_id=None,
+            )
+
+            # Check file content doesn't include account ID
+            with open(result, "r") as f:
+                content = f.read()
+                assert "Account:" not in content
+
+    def test_generate_html_report_creates_timestamped_file(self, gen):
         """Test that generate_html_report creates timestamped file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            generator = ReportGenerator(temp_dir)
-
-            summary = {
-                "total_cost": 100.0,
-                "service_count": 1,
-                "top_services": [{"service": "Amazon EC2", "cost": 100.0, "percentage": 100.0}],
-            }
-
-            with patch("clint.reports.generator.datetime") as mock_datetime:
-                mock_datetime.now.return_value.strftime.side_effect = [
-                    "2023-01-01 12:00:00 UTC",
-                    "20230101_120000",
-                ]
-
-                result = generator.generate_html_report(
-                    title="Test Report",
-                    summary=summary,
-                    services=[{"service": "Amazon EC2", "cost": 100.0}],
-                    days_back=30,
-                    account_id="****-****-1234",
-                )
-
-                # Check that timestamped file exists
-                timestamped_file = os.path.join(temp_dir, "aws_cost_report_20230101_120000.html")
-                assert os.path.exists(timestamped_file)
-                assert result == timestamped_file
-
-                # Check file content
-                with open(timestamped_file, "r") as f:
-                    content = f.read()
-                    assert "Test Report" in content
-                    assert "Amazon EC2" in content
-
-    def test_generate_html_report_template_rendering(self):
+        generator, temp_dir = gen
+
+        with time_machine.travel(FROZEN_NOW, tick=False):
+            result = generator.generate_html_report(
+                title="Test Report",
+                summary=_SUMMARY_BASIC,
+                services=_SERVICES_BASIC,
+                days_back=30,
+                account_id="****-****-1234",
+            )
+
+            # Check that timestamped file exists
+            timestamped_file = os.path.join(temp_dir, "aws_cost_report_20230101_120000.html")
+            assert os.path.exists(timestamped_file)
+            assert result == timestamped_file
+
+            # Check file content
+            with open(timestamped_file, "r") as f:
+                content = f.read()
+            expected = ("Test Report", "Amazon EC2")
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
+
+    def test_generate_html_report_template_rendering(self, gen):
         """Test that Jinja2 template is properly rendered."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            generator = ReportGenerator(temp_dir)
-
-            summary = {
-                "total_cost": 75.5,
-                "service_count": 2,
-                "top_services": [
-                    {"service": "Amazon EC2", "cost": 50.0, "percentage": 66.2},
-                    {"service": "Amazon S3", "cost": 25.5, "percentage": 33.8},
-                ],
-            }
-
-            services = [
-                {"service": "Amazon EC2", "cost": 50.0},
-                {"service": "Amazon S3", "cost": 25.5},
-            ]
-
-            with patch("clint.reports.generator.datetime") as mock_datetime:
-                mock_datetime.now.return_value.strftime.side_effect = [
-                    "2023-01-01 12:00:00 UTC",
-                    "20230101_120000",
-                ]
-
-                result = generator.generate_html_report(
-                    title="Template Test Report",
-                    summary=summary,
-                    services=services,
-                    days_back=30,
-                    account_id="****-****-5678",
-                )
-
-                with open(result, "r") as f:
-                    content = f.read()
-
-                    # Check template variables are rendered
-                    assert "Template Test Report" in content
-                    assert "2023-01-01 12:00:00 UTC" in content
-                    assert "Last 30 days" in content
-                    assert "****-****-5678" in content
-
-                    # Check summary data
-                    assert "$75.50" in content
-                    assert "2" in content  # service_count
-
-                    # Check service data
-                    assert "Amazon EC2" in content
-                    assert "Amazon S3" in content
-                    assert "$50.00" in content
-                    assert "$25.50" in content
-
-                    # Check percentages
-                    assert "66.2%" in content
-                    assert "33.8%" in content
-
-    def test_generate_html_report_file_naming(self):
+        generator, _ = gen
+
+        with time_machine.travel(FROZEN_NOW, tick=False):
+            result = generator.generate_html_report(
+                title="Template Test Report",
+                summary=_SUMMARY_TEMPLATE,
+                services=_SERVICES_TEMPLATE,
+                days_back=30,
+                account_id="****-****-5678",
+            )
+
+            with open(result, "r") as f:
+                content = f.read()
+
+            expected = (
+                # Template variables
+                "Template Test Report",
+                "2023-01-01 12:00:00 UTC",
+                "Last 30 days",
+                "****-****-5678",
+                # Summary data, including service_count
+                "$75.50",
+                "2",
+                # Service data
+                "Amazon EC2",
+                "Amazon S3",
+                "$50.00",
+                "$25.50",
+                # Percentages
+                "66.2%",
+                "33.8%",
+            )
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
+
+    def test_generate_html_report_file_naming(self, gen):
         """Test that generated files have correct naming pattern."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            generator = ReportGenerator(temp_dir)
-
-            summary = {"total_cost": 0.0, "service_count": 0, "top_services": []}
-
-            with patch("clint.reports.generator.datetime") as mock_datetime:
-                mock_datetime.now.return_value.strftime.side_effect = [
-                    "2023-01-01 12:00:00 UTC",
-                    "20230101_120000",
-                ]
-
-                result = generator.generate_html_report(
-                    title="Test Report",
-                    summary=summary,
-                    services=[],
-                    days_back=30,
-                    account_id=None,
-                )
-
-                # Check filename pattern
-                expected_filename = "aws_cost_report_20230101_120000.html"
-                assert result.endswith(expected_filename)
-
-                # Check that file exists
-                assert os.path.exists(result)
+        generator, _ = gen
+
+        with time_machine.travel(FROZEN_NOW, tick=False):
+            result = generator.generate_html_report(
+                title="Test Report",
+                summary=_SUMMARY_EMPTY,
+                services=[],
+                days_back=30,
+                account_id=None,
+            )
+
+            # Check filename pattern
+            expected_filename = "aws_cost_report_20230101_120000.html"
+            assert result.endswith(expected_filename)
+
+            # Check that file exists
+            assert os.path.exists(result)
 
 
 if __name__ == "__main__":
@@ -1,28 +1,78 @@
 """Tests to verify services container endpoint compliance."""
 import pytest
 import json
-import requests
+from functools import partial
+import orjson
+import responses
 from typing import Dict, Any
 
+BASE_URL = "http://35.88.22.9:8080"
+BASE_ENDPOINTS = ("/", "/health", "/api/health", "/api/status")
+# (connect, read) seconds
+HTTP_TIMEOUT = (1, 2)
 
+_TIMESTAMP = "2025-01-01T00:00:00"
+_VERSION = "test-version"
+
+# Canned responses of a compliant services container, keyed by path
+_ENDPOINT_RESPONSES = {
+    "/": {"body": "<!DOCTYPE html><html><body>Services</body></html>", "content_type": "text/html"},
+    "/health": {"json": {"status": "healthy", "timestamp": _TIMESTAMP, "version": _VERSION}},
+    "/api/health": {"json": {"status": "ok", "timestamp": _TIMESTAMP, "version": _VERSION}},
+    "/api/status": {
+        "json": {"service": "services", "version": _VERSION, "status": "running", "timestamp": _TIMESTAMP}
+    },
+    "/api/v1/calendar": {"json": {}},
+    "/api/v2/calendar": {"json": {}},
+    "/api/v1/astronomy": {"json": {}},
+    "/api/v2/astronomy": {"json": {}},
+}
+
+
+def _json(response):
+    """Decode a response body with orjson."""
+    return orjson.loads(response.content)
+
+
+@pytest.fixture(scope="session")
+def response_cache(http):
+    """Fetch each endpoint at most once per transport per run and hand back the cached response."""
+    cache = {}
+
+    def get(transport, path):
+        if (transport, path) not in cache:
+            cache[transport, path] = http.get(f"{BASE_URL}{path}", timeout=HTTP_TIMEOUT)
+        return cache[transport, path]
+
+    return get
+
+
+@pytest.mark.xdist_group("compliance")
 class TestServicesContainerCompliance:
     """Test cases for services container endpoint compliance."""
 
-    # Services container endpoint (update with actual IP/domain)
-    BASE_URL = "http://35.88.22.9:8080"
+    BASE_URL = BASE_URL
 
-    def test_root_endpoint_exists(self):
-        """Test that root endpoint exists and returns 200."""
-        response = requests.get(f"{self.BASE_URL}/", timeout=10)
-        assert response.status_code == 200, f"Root endpoint should return 200, got {response.status_code}"
-        
-        # Root endpoint can return HTML (for user-facing containers) or JSON
-        # Both are acceptable - HTML is fine for browser access, JSON is fine for API services
-        assert response.status_code == 200
+    @pytest.fixture(params=["mocked", pytest.param("live", marks=pytest.mark.live)])
+    def endpoint_cache(self, request, response_cache):
+        """Serve container endpoints from memory, or from the deployed host for the live variant."""
+        if request.param == "live":
+            yield partial(response_cache, "live")
+            return
+        with responses.RequestsMock(assert_all_requests_are_fired=False) as rsps:
+            for path, kwargs in _ENDPOINT_RESPONSES.items():
+                rsps.get(f"{BASE_URL}{path}", status=200, **kwargs)
+            yield partial(response_cache, "mocked")
+
+    @pytest.mark.parametrize("path", BASE_ENDPOINTS)
+    def test_endpoint_returns_200(self, endpoint_cache, path):
+        """Test that each base container endpoint exists and returns 200."""
+        response = endpoint_cache(path)
+        assert response.status_code == 200, f"Endpoint {path} should return 200, got {response.status_code}"
 
-    def test_root_endpoint_html_or_json(self):
+    def test_root_endpoint_html_or_json(self, endpoint_cache):
         """Test that root endpoint returns HTML or JSON (both acceptable)."""
-        response = requests.get(f"{self.BASE_URL}/", timeout=10)
+        response = endpoint_cache("/")
         assert response.status_code == 200
         
         # Check if it's HTML or JSON
@@ -36,20 +86,15 @@ class TestServicesContainerCompliance:
         # If HTML, that's fine - JSON service info is available via /api/status
         # If JSON, should have required fields
         if is_json:
-            data = response.json()
+            data = _json(response)
             assert "service" in data or "version" in data, "JSON root endpoint should include service info"
 
-    def test_health_endpoint_exists(self):
-        """Test that health endpoint exists."""
-        response = requests.get(f"{self.BASE_URL}/health", timeout=10)
-        assert response.status_code == 200, f"Health endpoint should return 200, got {response.status_code}"
-
-    def test_health_endpoint_format(self):
+    def test_health_endpoint_format(self, endpoint_cache):
         """Test that health endpoint matches base container format."""
-        response = requests.get(f"{self.BASE_URL}/health", timeout=10)
+        response = endpoint_cache("/health")
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         
         # Check required fields
         assert "status" in data, "Health endpoint should include 'status' field"
@@ -59,17 +104,12 @@ class TestServicesContainerCompliance:
         # Check format matches base container
         assert data["status"] == "healthy", "Health endpoint status should be 'healthy'"
 
-    def test_api_health_endpoint_exists(self):
-        """Test that API health endpoint exists."""
-        response = requests.get(f"{self.BASE_URL}/api/health", timeout=10)
-        assert response.status_code == 200, f"API health endpoint should return 200, got {response.status_code}"
-
-    def test_api_health_endpoint_format(self):
+    def test_api_health_endpoint_format(self, endpoint_cache):
         """Test that API health endpoint matches base container format."""
-        response = requests.get(f"{self.BASE_URL}/api/health", timeout=10)
+        response = endpoint_cache("/api/health")
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         
         # Check required fields
         assert "status" in data, "API health endpoint should include 'status' field"
@@ -79,30 +119,25 @@ class TestServicesContainerCompliance:
         # Check format matches base container
         assert data["status"] == "ok", "API health endpoint status should be 'ok'"
 
-    def test_api_health_different_from_health(self):
+    def test_api_health_different_from_health(self, endpoint_cache):
         """Test that /api/health returns different response than /health."""
-        health_response = requests.get(f"{self.BASE_URL}/health", timeout=10)
-        api_health_response = requests.get(f"{self.BASE_URL}/api/health", timeout=10)
+        health_response = endpoint_cache("/health")
+        api_health_response = endpoint_cache("/api/health")
         
-        health_data = health_response.json()
-        api_health_data = api_health_response.json()
+        health_data = _json(health_response)
+        api_health_data = _json(api_health_response)
         
         # They should have different status values
         assert health_data.get("status") != api_health_data.get("status") or \
                health_data.get("status") == "healthy" and api_health_data.get("status") == "ok", \
                "/api/health should return 'ok' while /health returns 'healthy'"
 
-    def test_api_status_endpoint_exists(self):
-        """Test that API status endpoint exists."""
-        response = requests.get(f"{self.BASE_URL}/api/status", timeout=10)
-        assert response.status_code == 200, f"API status endpoint should return 200, got {response.status_code}"
-
-    def test_api_status_endpoint_format(self):
+    def test_api_status_endpoint_format(self, endpoint_cache):
         """Test that API status endpoint matches base container format."""
-        response = requests.get(f"{self.BASE_URL}/api/status", timeout=10)
+        response = endpoint_cache("/api/status")
         assert response.status_code == 200
         
-        data = response.json()
+        data = _json(response)
         
         # Check required fields
         assert "service" in data, "API status endpoint should include 'service' field"
@@ -110,27 +145,27 @@ class TestServicesContainerCompliance:
         assert "status" in data, "API status endpoint should include 'status' field"
         assert "timestamp" in data, "API status endpoint should include 'timestamp' field"
 
-    def test_all_base_endpoints_implemented(self):
+    def test_all_base_endpoints_implemented(self, endpoint_cache):
         """Test that all required base container endpoints are implemented."""
         # Root endpoint can be HTML or JSON
-        root_response = requests.get(f"{self.BASE_URL}/", timeout=10)
+        root_response = endpoint_cache("/")
         assert root_response.status_code == 200, "Root endpoint should return 200"
         
         # Health endpoints MUST be JSON
         json_endpoints = ["/health", "/api/health", "/api/status"]
         
         for endpoint in json_endpoints:
-            response = requests.get(f"{self.BASE_URL}{endpoint}", timeout=10)
+            response = endpoint_cache(endpoint)
             assert response.status_code == 200, f"Endpoint {endpoint} should return 200"
             
             # Must return JSON
             try:
-                data = response.json()
+                data = _json(response)
                 assert isinstance(data, dict), f"Endpoint {endpoint} should return JSON object"
             except json.JSONDecodeError:
                 pytest.fail(f"Endpoint {endpoint} should return valid JSON")
 
-    def test_service_specific_endpoints_available(self):
+    def test_service_specific_endpoints_available(self, endpoint_cache):
         """Test that service-specific endpoints are available."""
         # Services container should provide versioned API endpoints
         endpoints = [
@@ -141,7 +176,7 @@ class TestServicesContainerCompliance:
         ]
         
         for endpoint in endpoints:
-            response = requests.get(f"{self.BASE_URL}{endpoint}", timeout=10)
+            response = endpoint_cache(endpoint)
             # These may return 404 if not implemented, but should not return 500
             assert response.status_code != 500, f"Endpoint {endpoint} should not return 500 error"
 
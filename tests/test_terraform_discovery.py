@@ -1,14 +1,54 @@
 """Tests for the TerraformDiscovery module."""
 
+import gzip
 import json
-import os
-import sys
-import tempfile
+import logging
+from datetime import datetime, timezone
+from types import MappingProxyType
 from unittest.mock import MagicMock, Mock, patch
 
+import boto3
 import pytest
+from botocore.exceptions import NoCredentialsError
+from botocore.stub import Stubber
 
-from clint.terraform.discovery import TerraformDiscovery
+from clint.terraform.discovery import _SAVE_POOL, TerraformDiscovery, _make_client
+
+# Map boto3 service names to TerraformDiscovery client keys
+_SERVICE_MAP = MappingProxyType({"ec2": "ec2", "route53": "r53", "s3": "s3", "iam": "iam", "cloudwatch": "cloudwatch"})
+_STUBBED_SERVICES = ("ec2", "route53", "s3", "iam", "cloudwatch", "resourcegroupstaggingapi")
+
+
+def _serve_pages(client):
+    """Make each paginator yield a single page taken from the mocked operation of the same name."""
+    client.get_paginator.side_effect = lambda op: Mock(paginate=lambda **kw: [getattr(client, op)(**kw)])
+
+
+@pytest.fixture(scope="session")
+def aws_clients():
+    """Real boto3 clients, built once per session, for Stubber-backed tests."""
+    return {service: boto3.client(service, region_name="us-east-1") for service in _STUBBED_SERVICES}
+
+
+@pytest.fixture
+def stubs(aws_clients, monkeypatch):
+    """Stub every AWS client and hand TerraformDiscovery the stubbed clients."""
+    monkeypatch.setattr("clint.terraform.discovery._make_client", lambda service, region: aws_clients[service])
+    stubbers = {service: Stubber(client) for service, client in aws_clients.items()}
+    for stubber in stubbers.values():
+        stubber.activate()
+    yield stubbers
+    for stubber in stubbers.values():
+        stubber.deactivate()
+        stubber.assert_no_pending_responses()
+
+
+@pytest.fixture(autouse=True)
+def fresh_clients():
+    """Drop cached boto3 clients so each test sees its own patched boto3.client."""
+    _make_client.cache_clear()
+    yield
+    _make_client.cache_clear()
 
 
 class TestTerraformDiscovery:
@@ -26,7 +66,7 @@ class TestTerraformDiscovery:
                 "cloudwatch": Mock(),
             }
 
-            def client_side_effect(service_name, region_name=None):
+            def client_side_effect(service_name, region_name=None, config=None):
                 return mock_clients.get(service_name, Mock())
 
             mock_boto_client.side_effect = client_side_effect
@@ -51,7 +91,7 @@ class TestTerraformDiscovery:
                 "cloudwatch": Mock(),
             }
 
-            def client_side_effect(service_name, region_name=None):
+            def client_side_effect(service_name, region_name=None, config=None):
                 return mock_clients.get(service_name, Mock())
 
             mock_boto_client.side_effect = client_side_effect
@@ -60,19 +100,21 @@ class TestTerraformDiscovery:
 
             assert discovery.region == "us-west-2"
 
-    def test_discover_ec2_instances_success(self):
-        """Test successful EC2 instances discovery."""
+    def test_clients_cached_across_instances(self):
+        """Test that boto3 clients are built once per service and region."""
         with patch("boto3.client") as mock_boto_client:
-            mock_ec2_client = Mock()
-            mock_clients = {"ec2": mock_ec2_client}
+            first = TerraformDiscovery()
+            second = TerraformDiscovery()
 
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
+            assert first.clients["ec2"] is second.clients["ec2"]
+            assert first.clients["vpc"] is first.clients["ec2"]
+            assert mock_boto_client.call_count == 6
 
-            mock_boto_client.side_effect = client_side_effect
-
-            # Mock EC2 response
-            mock_ec2_client.describe_instances.return_value = {
+    def test_discover_ec2_instances_success(self, stubs):
+        """Test successful EC2 instances discovery."""
+        stubs["ec2"].add_response(
+            "describe_instances",
+            {
                 "Reservations": [
                     {
                         "Instances": [
@@ -89,32 +131,26 @@ class TestTerraformDiscovery:
                         ]
                     }
                 ]
-            }
+            },
+        )
 
-            discovery = TerraformDiscovery()
-            discovery.discover_ec2_instances()
+        discovery = TerraformDiscovery()
+        discovery.discover_ec2_instances()
 
-            assert "ec2_instances" in discovery.discovered_resources
-            assert len(discovery.discovered_resources["ec2_instances"]) == 1
+        assert "ec2_instances" in discovery.discovered_resources
+        assert len(discovery.discovered_resources["ec2_instances"]) == 1
 
-            instance = discovery.discovered_resources["ec2_instances"][0]
-            assert instance["type"] == "aws_instance"
-            assert instance["id"] == "i-1234567890abcdef0"
-            assert instance["tags"]["Name"] == "test-instance"
+        instance = discovery.discovered_resources["ec2_instances"][0]
+        assert instance["type"] == "aws_instance"
+        assert instance["id"] == "i-1234567890abcdef0"
+        assert instance["tags"]["Name"] == "test-instance"
 
-    def test_discover_ec2_instances_filters_terminated(self):
+    def test_discover_ec2_instances_filters_terminated(self, stubs):
         """Test EC2 instances discovery filters out terminated instances."""
-        with patch("boto3.client") as mock_boto_client:
-            mock_ec2_client = Mock()
-            mock_clients = {"ec2": mock_ec2_client}
-
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
-
-            mock_boto_client.side_effect = client_side_effect
-
-            # Mock EC2 response with terminated instance
-            mock_ec2_client.describe_instances.return_value = {
+        # Response with terminated instance; the request must carry the server-side state filter
+        stubs["ec2"].add_response(
+            "describe_instances",
+            {
                 "Reservations": [
                     {
                         "Instances": [
@@ -135,51 +171,57 @@ class TestTerraformDiscovery:
                         ]
                     }
                 ]
-            }
+            },
+            {"Filters": [{"Name": "instance-state-name", "Values": ["pending", "running", "stopping", "stopped"]}]},
+        )
 
-            discovery = TerraformDiscovery()
-            discovery.discover_ec2_instances()
+        discovery = TerraformDiscovery()
+        discovery.discover_ec2_instances()
 
-            assert len(discovery.discovered_resources["ec2_instances"]) == 1
-            assert discovery.discovered_resources["ec2_instances"][0]["id"] == "i-running"
+        assert len(discovery.discovered_resources["ec2_instances"]) == 1
+        assert discovery.discovered_resources["ec2_instances"][0]["id"] == "i-running"
 
-    def test_discover_ec2_instances_error_handling(self):
+    def test_discover_ec2_instances_error_handling(self, stubs):
         """Test EC2 instances discovery error handling."""
-        with patch("boto3.client") as mock_boto_client:
-            mock_ec2_client = Mock()
-            mock_clients = {"ec2": mock_ec2_client}
+        stubs["ec2"].add_client_error("describe_instances", service_error_code="UnauthorizedOperation")
 
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
+        discovery = TerraformDiscovery()
+        discovery.discover_ec2_instances()
 
-            mock_boto_client.side_effect = client_side_effect
+        # Should not raise exception, just log error
+        assert "ec2_instances" not in discovery.discovered_resources
 
-            # Mock EC2 error
-            from botocore.exceptions import ClientError
+    def test_discover_ec2_instances_multiple_pages(self, stubs):
+        """Test EC2 instances discovery reads every paginator page."""
+        for n in range(3):
+            page = {"Reservations": [{"Instances": [{"InstanceId": f"i-{n}", "State": {"Name": "running"}}]}]}
+            if n < 2:
+                page["NextToken"] = f"token-{n}"
+            stubs["ec2"].add_response("describe_instances", page)
 
-            mock_ec2_client.describe_instances.side_effect = ClientError(
-                {"Error": {"Code": "UnauthorizedOperation"}}, "DescribeInstances"
-            )
+        discovery = TerraformDiscovery()
+        discovery.discover_ec2_instances()
 
-            discovery = TerraformDiscovery()
-            discovery.discover_ec2_instances()
+        assert [i["id"] for i in discovery.discovered_resources["ec2_instances"]] == ["i-0", "i-1", "i-2"]
 
-            # Should not raise exception, just log error
-            assert "ec2_instances" not in discovery.discovered_resources
+    def test_discover_reuses_results_within_ttl(self, stubs):
+        """Test repeated discovery within cache_ttl skips AWS until the cache is invalidated."""
+        stubs["ec2"].add_response("describe_instances", {"Reservations": []})
 
-    def test_discover_vpcs_success(self):
-        """Test successful VPCs discovery."""
-        with patch("boto3.client") as mock_boto_client:
-            mock_vpc_client = Mock()
-            mock_clients = {"ec2": mock_vpc_client}  # VPC is part of EC2
-
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
+        discovery = TerraformDiscovery(cache_ttl=60)
+        discovery.discover_ec2_instances()
+        # A second AWS call would find no queued response and fail
+        discovery.discover_ec2_instances()
 
-            mock_boto_client.side_effect = client_side_effect
+        stubs["ec2"].add_response("describe_instances", {"Reservations": []})
+        discovery.invalidate_cache()
+        discovery.discover_ec2_instances()
 
-            # Mock VPC response
-            mock_vpc_client.describe_vpcs.return_value = {
+    def test_discover_vpcs_success(self, stubs):
+        """Test successful VPCs discovery."""
+        stubs["ec2"].add_response(  # VPC is part of EC2
+            "describe_vpcs",
+            {
                 "Vpcs": [
                     {
                         "VpcId": "vpc-12345678",
@@ -188,133 +230,110 @@ class TestTerraformDiscovery:
                         "Tags": [{"Key": "Name", "Value": "test-vpc"}],
                     }
                 ]
-            }
+            },
+        )
 
-            discovery = TerraformDiscovery()
-            discovery.discover_vpcs()
+        discovery = TerraformDiscovery()
+        discovery.discover_vpcs()
 
-            assert "vpcs" in discovery.discovered_resources
-            assert len(discovery.discovered_resources["vpcs"]) == 1
+        assert "vpcs" in discovery.discovered_resources
+        assert len(discovery.discovered_resources["vpcs"]) == 1
 
-            vpc = discovery.discovered_resources["vpcs"][0]
-            assert vpc["type"] == "aws_vpc"
-            assert vpc["id"] == "vpc-12345678"
-            assert vpc["data"]["CidrBlock"] == "10.0.0.0/16"
+        vpc = discovery.discovered_resources["vpcs"][0]
+        assert vpc["type"] == "aws_vpc"
+        assert vpc["id"] == "vpc-12345678"
+        assert vpc["data"]["CidrBlock"] == "10.0.0.0/16"
 
-    def test_discover_s3_buckets_success(self):
+    def test_discover_s3_buckets_success(self, stubs):
         """Test successful S3 buckets discovery."""
-        with patch("boto3.client") as mock_boto_client:
-            mock_s3_client = Mock()
-            mock_clients = {"s3": mock_s3_client}
-
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
-
-            mock_boto_client.side_effect = client_side_effect
-
-            # Mock S3 response
-            mock_s3_client.list_buckets.return_value = {
+        stubs["s3"].add_response(
+            "list_buckets",
+            {
                 "Buckets": [
                     {"Name": "test-bucket-1", "CreationDate": "2023-01-01T00:00:00Z"},
                     {"Name": "test-bucket-2", "CreationDate": "2023-01-02T00:00:00Z"},
                 ]
-            }
+            },
+        )
 
-            discovery = TerraformDiscovery()
-            discovery.discover_s3_buckets()
+        discovery = TerraformDiscovery()
+        discovery.discover_s3_buckets()
 
-            assert "s3_buckets" in discovery.discovered_resources
-            assert len(discovery.discovered_resources["s3_buckets"]) == 2
+        assert "s3_buckets" in discovery.discovered_resources
+        assert len(discovery.discovered_resources["s3_buckets"]) == 2
 
-            bucket = discovery.discovered_resources["s3_buckets"][0]
-            assert bucket["type"] == "aws_s3_bucket"
-            assert bucket["id"] == "test-bucket-1"
+        bucket = discovery.discovered_resources["s3_buckets"][0]
+        assert bucket["type"] == "aws_s3_bucket"
+        assert bucket["id"] == "test-bucket-1"
 
-    def test_discover_iam_roles_success(self):
+    def test_discover_iam_roles_success(self, stubs):
         """Test successful IAM roles discovery."""
-        with patch("boto3.client") as mock_boto_client:
-            mock_iam_client = Mock()
-            mock_clients = {"iam": mock_iam_client}
-
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
-
-            mock_boto_client.side_effect = client_side_effect
-
-            # Mock IAM response
-            mock_iam_client.list_roles.return_value = {
+        stubs["iam"].add_response(
+            "list_roles",
+            {
                 "Roles": [
                     {
+                        "Path": "/",
                         "RoleName": "test-role-1",
+                        "RoleId": "AROA1234567890EXAMPLE",
                         "Arn": "arn:aws:iam::123456789012:role/test-role-1",
                         "CreateDate": "2023-01-01T00:00:00Z",
                         "Tags": [{"Key": "Environment", "Value": "test"}],
                     }
                 ]
-            }
+            },
+        )
 
-            discovery = TerraformDiscovery()
-            discovery.discover_iam_roles()
+        discovery = TerraformDiscovery()
+        discovery.discover_iam_roles()
 
-            assert "iam_roles" in discovery.discovered_resources
-            assert len(discovery.discovered_resources["iam_roles"]) == 1
+        assert "iam_roles" in discovery.discovered_resources
+        assert len(discovery.discovered_resources["iam_roles"]) == 1
 
-            role = discovery.discovered_resources["iam_roles"][0]
-            assert role["type"] == "aws_iam_role"
-            assert role["id"] == "test-role-1"
-            assert role["tags"]["Environment"] == "test"
+        role = discovery.discovered_resources["iam_roles"][0]
+        assert role["type"] == "aws_iam_role"
+        assert role["id"] == "test-role-1"
+        assert role["tags"]["Environment"] == "test"
 
-    def test_discover_route53_zones_success(self):
+    def test_discover_route53_zones_success(self, stubs):
         """Test successful Route53 zones discovery."""
-        with patch("boto3.client") as mock_boto_client:
-            mock_r53_client = Mock()
-            mock_clients = {"route53": mock_r53_client}
-
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
-
-            mock_boto_client.side_effect = client_side_effect
-
-            # Mock Route53 response
-            mock_r53_client.list_hosted_zones.return_value = {
+        stubs["route53"].add_response(
+            "list_hosted_zones",
+            {
                 "HostedZones": [
                     {
                         "Id": "/hostedzone/Z1234567890",
                         "Name": "example.com.",
                         "CallerReference": "test-ref",
                     }
-                ]
-            }
+                ],
+                "Marker": "",
+                "IsTruncated": False,
+                "MaxItems": "100",
+            },
+        )
 
-            discovery = TerraformDiscovery()
-            discovery.discover_route53_zones()
+        discovery = TerraformDiscovery()
+        discovery.discover_route53_zones()
 
-            assert "route53_zones" in discovery.discovered_resources
-            assert len(discovery.discovered_resources["route53_zones"]) == 1
+        assert "route53_zones" in discovery.discovered_resources
+        assert len(discovery.discovered_resources["route53_zones"]) == 1
 
-            zone = discovery.discovered_resources["route53_zones"][0]
-            assert zone["type"] == "aws_route53_zone"
-            assert zone["id"] == "Z1234567890"  # Should remove /hostedzone/ prefix
+        zone = discovery.discovered_resources["route53_zones"][0]
+        assert zone["type"] == "aws_route53_zone"
+        assert zone["id"] == "Z1234567890"  # Should remove /hostedzone/ prefix
 
-    def test_discover_route53_records_success(self):
+    def test_discover_route53_records_success(self, stubs):
         """Test successful Route53 records discovery."""
-        with patch("boto3.client") as mock_boto_client:
-            mock_r53_client = Mock()
-            mock_clients = {"route53": mock_r53_client}
-
-            def client_side_effect(service_name, region_name=None):
-                return mock_clients.get(service_name, Mock())
-
-            mock_boto_client.side_effect = client_side_effect
-
-            # First set up zones
-            discovery = TerraformDiscovery()
-            discovery.discovered_resources["route53_zones"] = [
-                {"data": {"Id": "/hostedzone/Z1234567890"}, "id": "Z1234567890"}
-            ]
-
-            # Mock Route53 records response
-            mock_r53_client.list_resource_record_sets.return_value = {
+        # First set up zones
+        discovery = TerraformDiscovery()
+        discovery.discovered_resources["route53_zones"] = [
+            {"data": {"Id": "/hostedzone/Z1234567890"}, "id": "Z1234567890"}
+        ]
+
+        stubs["route53"].add_response(
+            "list_resource_record_sets",
+            {
                 "ResourceRecordSets": [
                     {
                         "Name": "www.example.com.",
@@ -328,64 +347,132 @@ class TestTerraformDiscovery:
                         "TTL": 172800,
                         "ResourceRecords": [{"Value": "ns-123.awsdns-12.com."}],
                     },
+                ],
+                "IsTruncated": False,
+                "MaxItems": "300",
+            },
+            {"HostedZoneId": "/hostedzone/Z1234567890"},
+        )
+
+        discovery.discover_route53_records()
+
+        assert "route53_records" in discovery.discovered_resources
+        assert len(discovery.discovered_resources["route53_records"]) == 1  # NS record should be skipped
+
+        record = discovery.discovered_resources["route53_records"][0]
+        assert record["type"] == "aws_route53_record"
+        assert record["id"] == "Z1234567890_www.example.com._A"
+
+    def test_discover_by_tags(self, stubs):
+        """Test tag-scoped discovery through the Resource Groups Tagging API."""
+        tag_filters = [{"Key": "Environment", "Values": ["production"]}]
+        stubs["resourcegroupstaggingapi"].add_response(
+            "get_resources",
+            {
+                "ResourceTagMappingList": [
+                    {
+                        "ResourceARN": "arn:aws:ec2:us-east-1:123456789012:instance/i-1234567890abcdef0",
+                        "Tags": [{"Key": "Environment", "Value": "production"}],
+                    },
+                    {
+                        "ResourceARN": "arn:aws:s3:::test-bucket",
+                        "Tags": [{"Key": "Environment", "Value": "production"}],
+                    },
                 ]
-            }
-
-            discovery.discover_route53_records()
+            },
+            {"TagFilters": tag_filters, "ResourceTypeFilters": ["ec2:instance", "s3"]},
+        )
 
-            assert "route53_records" in discovery.discovered_resources
-            assert len(discovery.discovered_resources["route53_records"]) == 1  # NS record should be skipped
+        discovery = TerraformDiscovery()
+        resources = discovery.discover_by_tags(tag_filters, ["ec2:instance", "s3"])
 
-            record = discovery.discovered_resources["route53_records"][0]
-            assert record["type"] == "aws_route53_record"
-            assert record["id"] == "Z1234567890_www.example.com._A"
+        assert [r["type"] for r in resources] == ["ec2:instance", "s3"]
+        assert resources[0]["tags"] == {"Environment": "production"}
+        assert discovery.discovered_resources["tagged_resources"] == resources
 
-    def test_save_discovery_results(self):
+    def test_save_discovery_results(self, tmp_path, monkeypatch):
         """Test saving discovery results to JSON file."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch("boto3.client") as mock_boto_client:
-                mock_clients = {"ec2": Mock()}
-
-                def client_side_effect(service_name, region_name=None):
-                    return mock_clients.get(service_name, Mock())
-
-                mock_boto_client.side_effect = client_side_effect
-
-                discovery = TerraformDiscovery()
-                discovery.discovered_resources = {
-                    "ec2_instances": [
-                        {
-                            "type": "aws_instance",
-                            "id": "i-1234567890abcdef0",
-                            "data": {"InstanceId": "i-1234567890abcdef0"},
-                            "tags": {"Name": "test-instance"},
-                        }
-                    ]
+        with patch("boto3.client"):
+            discovery = TerraformDiscovery()
+        discovery.discovered_resources = {
+            "ec2_instances": [
+                {
+                    "type": "aws_instance",
+                    "id": "i-1234567890abcdef0",
+                    "data": {
+                        "InstanceId": "i-1234567890abcdef0",
+                        "LaunchTime": datetime(2023, 1, 1, tzinfo=timezone.utc),
+                    },
+                    "tags": {"Name": "test-instance"},
                 }
+            ]
+        }
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "terraform_output").mkdir()
+
+        discovery._save_discovery_results()
+
+        # Check that file was created
+        output_files = list(tmp_path.glob("terraform_output/discovered_resources_*.json"))
+        assert len(output_files) == 1
+
+        # Check file content
+        data = json.loads(output_files[0].read_text())
+        assert "ec2_instances" in data
+        assert len(data["ec2_instances"]) == 1
+        assert data["ec2_instances"][0]["data"]["LaunchTime"] == "2023-01-01T00:00:00+00:00"
+
+    def test_discover_all_resources_propagates_botocore_errors(self, monkeypatch):
+        """Test that a non-API error in a discovery worker aborts discovery without saving."""
+        with patch("boto3.client"):
+            discovery = TerraformDiscovery()
+        for name in dir(discovery):
+            if name.startswith("discover_") and name not in ("discover_all_resources", "discover_by_tags"):
+                monkeypatch.setattr(discovery, name, lambda: None)
+
+        def no_credentials():
+            raise NoCredentialsError()
 
-                # Change to temp directory and create terraform_output
-                original_cwd = os.getcwd()
-                os.chdir(temp_dir)
-                os.makedirs("terraform_output", exist_ok=True)
-
-                try:
-                    discovery._save_discovery_results()
-
-                    # Check that file was created
-                    output_files = [
-                        f
-                        for f in os.listdir("terraform_output")
-                        if f.startswith("discovered_resources_") and f.endswith(".json")
-                    ]
-                    assert len(output_files) == 1
-                finally:
-                    os.chdir(original_cwd)
-
-                # Check file content
-                with open(os.path.join(temp_dir, "terraform_output", output_files[0]), "r") as f:
-                    data = json.load(f)
-                    assert "ec2_instances" in data
-                    assert len(data["ec2_instances"]) == 1
+        monkeypatch.setattr(discovery, "discover_vpcs", no_credentials)
+
+        with pytest.raises(NoCredentialsError):
+            discovery.discover_all_resources()
+        assert discovery._save_future is None
+
+    def test_discover_all_resources_save_failure(self, monkeypatch, caplog):
+        """Test that a failing background save is logged and re-raised by wait_save()."""
+        with patch("boto3.client"):
+            discovery = TerraformDiscovery()
+        for name in dir(discovery):
+            if name.startswith("discover_") and name not in ("discover_all_resources", "discover_by_tags"):
+                monkeypatch.setattr(discovery, name, lambda: None)
+
+        def failing_save():
+            raise OSError("disk full")
+
+        monkeypatch.setattr(discovery, "_save_discovery_results", failing_save)
+
+        with caplog.at_level(logging.ERROR, logger="clint.terraform.discovery"):
+            discovery.discover_all_resources()
+            with pytest.raises(OSError, match="disk full"):
+                discovery.wait_save()
+            # The single save worker runs the done callback before it takes the next job
+            _SAVE_POOL.submit(int).result()
+
+        assert "Error saving discovery results: disk full" in caplog.text
+
+    def test_save_discovery_results_compressed(self, tmp_path, monkeypatch):
+        """Test saving discovery results as gzipped JSON."""
+        with patch("boto3.client"):
+            discovery = TerraformDiscovery(compress=True)
+        discovery.discovered_resources = {"vpcs": [{"type": "aws_vpc", "id": "vpc-1", "data": {}, "tags": {}}]}
+        monkeypatch.chdir(tmp_path)
+
+        discovery._save_discovery_results()
+
+        (output_file,) = (tmp_path / "terraform_output").glob("discovered_resources_*.json.gz")
+        with gzip.open(output_file, "rt") as f:
+            assert json.load(f)["vpcs"][0]["id"] == "vpc-1"
 
     def test_discover_all_resources(self):
         """Test discovering all resources."""
@@ -400,17 +487,10 @@ class TestTerraformDiscovery:
                 "cloudwatch": Mock(),
             }
 
-            def client_side_effect(service_name, region_name=None):
-                # Map boto3 service names to our client keys
-                service_mapping = {
-                    "ec2": "ec2",
-                    "route53": "r53",
-                    "s3": "s3",
-                    "iam": "iam",
-                    "cloudwatch": "cloudwatch",
-                }
-                client_key = service_mapping.get(service_name, service_name)
-                return mock_clients.get(client_key, Mock())
+            default_client = Mock()
+
+            def client_side_effect(service_name, region_name=None, config=None):
+                return mock_clients.get(_SERVICE_MAP.get(service_name, service_name), default_client)
 
             mock_boto_client.side_effect = client_side_effect
 
@@ -430,10 +510,16 @@ class TestTerraformDiscovery:
             mock_clients["iam"].list_roles.return_value = {"Roles": []}
             mock_clients["iam"].list_policies.return_value = {"Policies": []}
 
+            _serve_pages(mock_clients["iam"])
+            _serve_pages(mock_clients["r53"])
+            _serve_pages(mock_clients["s3"])
+            _serve_pages(mock_ec2_client)
             discovery = TerraformDiscovery()
 
-            with patch.object(discovery, "_save_discovery_results"):
+            with patch.object(discovery, "_save_discovery_results") as mock_save:
                 result = discovery.discover_all_resources()
+                discovery.wait_save()
+                mock_save.assert_called_once_with()
 
                 # Check that all resource types are present
                 expected_types = [
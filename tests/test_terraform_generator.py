@@ -1,40 +1,104 @@
 """Tests for the TerraformGenerator module."""
 
+import copy
+import gzip
+import io
 import json
 import os
-import sys
-import tempfile
-from unittest.mock import Mock, mock_open, patch
+from unittest.mock import Mock, patch
 
 import pytest
 
 from clint.terraform.generator import TerraformGenerator
 
+# Every step generate_all_configurations runs
+_GENERATION_STEPS = (
+    "generate_main_tf",
+    "generate_variables_tf",
+    "generate_outputs_tf",
+    "generate_providers_tf",
+    "generate_region_configurations",
+    "generate_ec2_resources",
+    "generate_vpc_resources",
+    "generate_route53_resources",
+    "generate_s3_resources",
+    "generate_iam_resources",
+    "generate_modules",
+)
+
+
+# Serialized discovery results served by the patched open in the loader test
+_MOCK_DISCOVERY_JSON = json.dumps(
+    {
+        "ec2_instances": [
+            {
+                "type": "aws_instance",
+                "id": "i-1234567890abcdef0",
+                "data": {
+                    "InstanceId": "i-1234567890abcdef0",
+                    "Placement": {"AvailabilityZone": "us-east-1a"},
+                },
+                "tags": {"Name": "test-instance"},
+            }
+        ]
+    }
+)
+
+
+def _fake_open(data):
+    """Stand-in for builtins.open that serves data from an in-memory buffer."""
+    return lambda *args, **kwargs: io.StringIO(data)
+
+
+def _no_resources(self):
+    """Stand-in for TerraformGenerator._load_all_discovered_resources."""
+    return {}
+
+
+@pytest.fixture
+def no_discovery(monkeypatch):
+    """Make TerraformGenerator start without loading any discovery results."""
+    monkeypatch.setattr(TerraformGenerator, "_load_all_discovered_resources", _no_resources)
+
+
+@pytest.fixture(scope="module")
+def shared_generator(tmp_path_factory):
+    """One TerraformGenerator per module, writing under a temporary directory, with no discovery results loaded."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setattr(TerraformGenerator, "_load_all_discovered_resources", _no_resources)
+        return TerraformGenerator(str(tmp_path_factory.mktemp("tf")))
+
+
+@pytest.fixture
+def generator(shared_generator):
+    """A shallow copy of the shared generator with its own resource name registry."""
+    gen = copy.copy(shared_generator)
+    gen.resource_names = {}
+    return gen
+
 
 class TestTerraformGenerator:
     """Test cases for TerraformGenerator."""
 
-    def test_init_default_output_dir(self):
+    def test_init_default_output_dir(self, no_discovery):
         """Test TerraformGenerator initialization with default output directory."""
         with patch("os.makedirs") as mock_makedirs:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator()
+            generator = TerraformGenerator()
 
-                assert generator.output_dir == "terraform"
-                assert generator.resource_names == {}
-                assert generator.regions == {}
-                mock_makedirs.assert_any_call("terraform", exist_ok=True)
-                mock_makedirs.assert_any_call("terraform/modules", exist_ok=True)
-                mock_makedirs.assert_any_call("terraform/environments", exist_ok=True)
+            assert generator.output_dir == "terraform"
+            assert generator.resource_names == {}
+            assert generator.regions == {}
+            mock_makedirs.assert_any_call("terraform", exist_ok=True)
+            mock_makedirs.assert_any_call("terraform/modules", exist_ok=True)
+            mock_makedirs.assert_any_call("terraform/environments", exist_ok=True)
 
-    def test_init_custom_output_dir(self):
+    def test_init_custom_output_dir(self, no_discovery):
         """Test TerraformGenerator initialization with custom output directory."""
         with patch("os.makedirs") as mock_makedirs:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator("custom_terraform")
+            generator = TerraformGenerator("custom_terraform")
 
-                assert generator.output_dir == "custom_terraform"
-                mock_makedirs.assert_any_call("custom_terraform", exist_ok=True)
+            assert generator.output_dir == "custom_terraform"
+            mock_makedirs.assert_any_call("custom_terraform", exist_ok=True)
 
     def test_load_all_discovered_resources_no_directory(self):
         """Test loading discovered resources when directory doesn't exist."""
@@ -57,21 +121,7 @@ class TestTerraformGenerator:
         """Test successful loading of discovered resources."""
         with patch("os.path.exists", return_value=True):
             with patch("os.listdir", return_value=["discovered_resources_20230101_120000.json"]):
-                mock_resources = {
-                    "ec2_instances": [
-                        {
-                            "type": "aws_instance",
-                            "id": "i-1234567890abcdef0",
-                            "data": {
-                                "InstanceId": "i-1234567890abcdef0",
-                                "Placement": {"AvailabilityZone": "us-east-1a"},
-                            },
-                            "tags": {"Name": "test-instance"},
-                        }
-                    ]
-                }
-
-                with patch("builtins.open", mock_open(read_data=json.dumps(mock_resources))):
+                with patch("builtins.open", _fake_open(_MOCK_DISCOVERY_JSON)):
                     generator = TerraformGenerator()
                     result = generator._load_all_discovered_resources()
 
@@ -79,10 +129,20 @@ class TestTerraformGenerator:
                     assert len(result["ec2_instances"]) == 1
                     assert result["ec2_instances"][0]["region"] == "us-east-1"
 
-    def test_determine_region_from_resources(self):
-        """Test region determination from resource data."""
-        generator = TerraformGenerator()
+    def test_load_all_discovered_resources_compressed(self, tmp_path, monkeypatch):
+        """Test loading gzipped discovery results."""
+        monkeypatch.chdir(tmp_path)
+        (tmp_path / "terraform_output").mkdir()
+        resources = {"vpcs": [{"type": "aws_vpc", "id": "vpc-1", "data": {}, "tags": {}}]}
+        with gzip.open(tmp_path / "terraform_output" / "discovered_resources_20230101_120000.json.gz", "wt") as f:
+            json.dump(resources, f)
+
+        generator = TerraformGenerator(str(tmp_path / "terraform"))
+
+        assert [r["id"] for r in generator.discovered_resources["vpcs"]] == ["vpc-1"]
 
+    def test_determine_region_from_resources(self, generator):
+        """Test region determination from resource data."""
         # Test with EC2 instances
         resources_with_ec2 = {"ec2_instances": [{"data": {"Placement": {"AvailabilityZone": "us-west-2a"}}}]}
         region = generator._determine_region_from_resources(resources_with_ec2)
@@ -93,302 +153,227 @@ class TestTerraformGenerator:
         region = generator._determine_region_from_resources(resources_with_vpc)
         assert region == "us-east-1"  # Default fallback
 
-    def test_generate_main_tf(self):
+    def test_generate_main_tf(self, generator, monkeypatch):
         """Test main.tf file generation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator(temp_dir)
-
-                with patch.object(generator, "_generate_import_blocks", return_value="# Import blocks"):
-                    with patch.object(
-                        generator,
-                        "_generate_resource_blocks",
-                        return_value="# Resource blocks",
-                    ):
-                        generator.generate_main_tf()
-
-                        main_tf_path = os.path.join(temp_dir, "main.tf")
-                        assert os.path.exists(main_tf_path)
-
-                        with open(main_tf_path, "r") as f:
-                            content = f.read()
-                            assert "terraform {" in content
-                            assert "required_version" in content
-                            assert "required_providers" in content
-                            assert "# Import blocks" in content
-                            assert "# Resource blocks" in content
-
-    def test_generate_providers_tf(self):
-        """Test providers.tf file generation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator(temp_dir)
-                generator.generate_providers_tf()
-
-                providers_tf_path = os.path.join(temp_dir, "providers.tf")
-                assert os.path.exists(providers_tf_path)
-
-                with open(providers_tf_path, "r") as f:
-                    content = f.read()
-                    assert 'provider "aws"' in content
-                    assert "region = var.aws_region" in content
-
-    def test_generate_variables_tf(self):
-        """Test variables.tf file generation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator(temp_dir)
-                generator.generate_variables_tf()
-
-                variables_tf_path = os.path.join(temp_dir, "variables.tf")
-                assert os.path.exists(variables_tf_path)
-
-                with open(variables_tf_path, "r") as f:
-                    content = f.read()
-                    assert 'variable "aws_region"' in content
-                    assert 'variable "project_name"' in content
-                    assert 'variable "environment"' in content
-
-    def test_generate_outputs_tf(self):
-        """Test outputs.tf file generation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator(temp_dir)
-
-                with patch.object(generator, "_generate_output_blocks", return_value="# Output blocks"):
-                    generator.generate_outputs_tf()
+        monkeypatch.setattr(generator, "_generate_import_blocks", lambda *a, **k: "# Import blocks")
+        monkeypatch.setattr(generator, "_generate_resource_blocks", lambda *a, **k: "# Resource blocks")
+        generator.generate_main_tf()
 
-                    outputs_tf_path = os.path.join(temp_dir, "outputs.tf")
-                    assert os.path.exists(outputs_tf_path)
+        main_tf_path = os.path.join(generator.output_dir, "main.tf")
+        assert os.path.exists(main_tf_path)
 
-                    with open(outputs_tf_path, "r") as f:
-                        content = f.read()
-                        assert "# Output definitions" in content
-                        assert "# Output blocks" in content
-
-    def test_generate_import_block_ec2_instance(self):
-        """Test import block generation for EC2 instance."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
-
-            resource = {
-                "type": "aws_instance",
-                "id": "i-1234567890abcdef0",
-                "data": {"InstanceId": "i-1234567890abcdef0"},
-            }
-
-            with patch.object(generator, "_get_resource_name", return_value="test_instance"):
-                result = generator._generate_import_block(resource)
-
-                assert "import {" in result
-                assert "to = aws_instance.test_instance" in result
-                assert 'id = "i-1234567890abcdef0"' in result
-
-    def test_generate_import_block_vpc(self):
-        """Test import block generation for VPC."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
+        with open(main_tf_path, "r") as f:
+            content = f.read()
+            expected = ("terraform {", "required_version", "required_providers", "# Import blocks", "# Resource blocks")
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
 
-            resource = {
-                "type": "aws_vpc",
-                "id": "vpc-12345678",
-                "data": {"VpcId": "vpc-12345678"},
-            }
-
-            with patch.object(generator, "_get_resource_name", return_value="test_vpc"):
-                result = generator._generate_import_block(resource)
-
-                assert "import {" in result
-                assert "to = aws_vpc.test_vpc" in result
-                assert 'id = "vpc-12345678"' in result
+    def test_generate_providers_tf(self, generator):
+        """Test providers.tf file generation."""
+        generator.generate_providers_tf()
 
-    def test_generate_import_block_route53_record(self):
-        """Test import block generation for Route53 record."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
+        providers_tf_path = os.path.join(generator.output_dir, "providers.tf")
+        assert os.path.exists(providers_tf_path)
 
-            resource = {
-                "type": "aws_route53_record",
-                "id": "Z1234567890_www.example.com._A",
-                "data": {"Name": "www.example.com.", "Type": "A"},
-                "zone_id": "/hostedzone/Z1234567890",
-            }
+        with open(providers_tf_path, "r") as f:
+            content = f.read()
+            expected = ('provider "aws"', "region = var.aws_region")
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
 
-            with patch.object(generator, "_get_resource_name", return_value="test_record"):
-                result = generator._generate_import_block(resource)
+    def test_generate_variables_tf(self, generator):
+        """Test variables.tf file generation."""
+        generator.generate_variables_tf()
 
-                assert "import {" in result
-                assert "to = aws_route53_record.test_record" in result
-                assert 'id = "Z1234567890_www.example.com._A"' in result
+        variables_tf_path = os.path.join(generator.output_dir, "variables.tf")
+        assert os.path.exists(variables_tf_path)
 
-    def test_generate_resource_block_ec2_instance(self):
-        """Test resource block generation for EC2 instance."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
+        with open(variables_tf_path, "r") as f:
+            content = f.read()
+            expected = ('variable "aws_region"', 'variable "project_name"', 'variable "environment"')
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
 
-            resource = {
-                "type": "aws_instance",
-                "id": "i-1234567890abcdef0",
-                "data": {
-                    "InstanceId": "i-1234567890abcdef0",
-                    "ImageId": "ami-12345678",
-                    "InstanceType": "t3.micro",
-                    "SubnetId": "subnet-12345678",
-                    "SecurityGroups": [{"GroupId": "sg-12345678"}],
-                    "Tags": [{"Key": "Name", "Value": "test-instance"}],
+    def test_generate_outputs_tf(self, generator, monkeypatch):
+        """Test outputs.tf file generation."""
+        monkeypatch.setattr(generator, "_generate_output_blocks", lambda *a, **k: "# Output blocks")
+        generator.generate_outputs_tf()
+
+        outputs_tf_path = os.path.join(generator.output_dir, "outputs.tf")
+        assert os.path.exists(outputs_tf_path)
+
+        with open(outputs_tf_path, "r") as f:
+            content = f.read()
+            expected = ("# Output definitions", "# Output blocks")
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
+
+    @pytest.mark.parametrize(
+        "rtype, rid, rdata, rname",
+        [
+            ("aws_instance", "i-1234567890abcdef0", {"InstanceId": "i-1234567890abcdef0"}, "test_instance"),
+            ("aws_vpc", "vpc-12345678", {"VpcId": "vpc-12345678"}, "test_vpc"),
+            (
+                "aws_route53_record",
+                "Z1234567890_www.example.com._A",
+                {"Name": "www.example.com.", "Type": "A"},
+                "test_record",
+            ),
+        ],
+        ids=["ec2_instance", "vpc", "route53_record"],
+    )
+    def test_generate_import_block(self, generator, monkeypatch, rtype, rid, rdata, rname):
+        """Test import block generation for each supported resource type."""
+        monkeypatch.setattr(generator, "_get_resource_name", lambda *a, **k: rname)
+        # Route 53 records build their import id from the hosted zone
+        resource = {"type": rtype, "id": rid, "data": rdata, "zone_id": "/hostedzone/Z1234567890"}
+        result = generator._generate_import_block(resource)
+
+        expected = ("import {", f"to = {rtype}.{rname}", f'id = "{rid}"')
+        missing = [s for s in expected if s not in result]
+        assert not missing, missing
+
+    @pytest.mark.parametrize(
+        "resource, name, expected",
+        [
+            pytest.param(
+                {
+                    "type": "aws_instance",
+                    "id": "i-1234567890abcdef0",
+                    "data": {
+                        "InstanceId": "i-1234567890abcdef0",
+                        "ImageId": "ami-12345678",
+                        "InstanceType": "t3.micro",
+                        "SubnetId": "subnet-12345678",
+                        "SecurityGroups": [{"GroupId": "sg-12345678"}],
+                        "Tags": [{"Key": "Name", "Value": "test-instance"}],
+                    },
                 },
-            }
-
-            with patch.object(generator, "_get_resource_name", return_value="test_instance"):
-                result = generator._generate_resource_block(resource, "us_east_1")
-
-                assert 'resource "aws_instance" "test_instance"' in result
-                assert "provider = aws.us_east_1" in result
-                assert 'ami           = "ami-12345678"' in result
-                assert 'instance_type = "t3.micro"' in result
-
-    def test_generate_resource_block_vpc(self):
-        """Test resource block generation for VPC."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
-
-            resource = {
-                "type": "aws_vpc",
-                "id": "vpc-12345678",
-                "data": {
-                    "VpcId": "vpc-12345678",
-                    "CidrBlock": "10.0.0.0/16",
-                    "EnableDnsHostnames": True,
-                    "EnableDnsSupport": True,
-                    "Tags": [{"Key": "Name", "Value": "test-vpc"}],
+                "test_instance",
+                (
+                    'resource "aws_instance" "test_instance"',
+                    "provider = aws.us_east_1",
+                    'ami           = "ami-12345678"',
+                    'instance_type = "t3.micro"',
+                ),
+                id="ec2_instance",
+            ),
+            pytest.param(
+                {
+                    "type": "aws_vpc",
+                    "id": "vpc-12345678",
+                    "data": {
+                        "VpcId": "vpc-12345678",
+                        "CidrBlock": "10.0.0.0/16",
+                        "EnableDnsHostnames": True,
+                        "EnableDnsSupport": True,
+                        "Tags": [{"Key": "Name", "Value": "test-vpc"}],
+                    },
                 },
-            }
-
-            with patch.object(generator, "_get_resource_name", return_value="test_vpc"):
-                result = generator._generate_resource_block(resource, "us_east_1")
-
-                assert 'resource "aws_vpc" "test_vpc"' in result
-                assert 'cidr_block           = "10.0.0.0/16"' in result
-                assert "enable_dns_hostnames = true" in result
-                assert "enable_dns_support   = true" in result
-
-    def test_get_resource_name_from_tags(self):
+                "test_vpc",
+                (
+                    'resource "aws_vpc" "test_vpc"',
+                    'cidr_block           = "10.0.0.0/16"',
+                    "enable_dns_hostnames = true",
+                    "enable_dns_support   = true",
+                ),
+                id="vpc",
+            ),
+        ],
+    )
+    def test_generate_resource_block(self, generator, monkeypatch, resource, name, expected):
+        """Test resource block generation for each supported resource type."""
+        monkeypatch.setattr(generator, "_get_resource_name", lambda *a, **k: name)
+        result = generator._generate_resource_block(resource, "us_east_1")
+
+        missing = [s for s in expected if s not in result]
+        assert not missing, missing
+
+    def test_get_resource_name_from_tags(self, generator, monkeypatch):
         """Test resource name generation from tags."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
-
-            resource = {"tags": {"Name": "test-resource"}, "id": "i-1234567890abcdef0"}
+        resource = {"tags": {"Name": "test-resource"}, "id": "i-1234567890abcdef0"}
+        monkeypatch.setattr(generator, "_sanitize_name", lambda *a, **k: "test_resource")
 
-            with patch.object(generator, "_sanitize_name", return_value="test_resource"):
-                result = generator._get_resource_name(resource, "aws_instance")
+        result = generator._get_resource_name(resource, "aws_instance")
 
-                assert result == "test_resource"
+        assert result == "test_resource"
 
-    def test_get_resource_name_from_id(self):
+    def test_get_resource_name_from_id(self, generator, monkeypatch):
         """Test resource name generation from ID when no tags."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
-
-            resource = {"tags": {}, "id": "i-1234567890abcdef0"}
-
-            with patch.object(generator, "_sanitize_name", return_value="i_1234567890abcdef0"):
-                result = generator._get_resource_name(resource, "aws_instance")
-
-                assert result == "i_1234567890abcdef0"
-
-    def test_sanitize_name(self):
+        resource = {"tags": {}, "id": "i-1234567890abcdef0"}
+        monkeypatch.setattr(generator, "_sanitize_name", lambda *a, **k: "i_1234567890abcdef0")
+
+        result = generator._get_resource_name(resource, "aws_instance")
+
+        assert result == "i_1234567890abcdef0"
+
+    @pytest.mark.parametrize(
+        "raw, expected",
+        [
+            ("test-resource", "test-resource"),
+            ("test.resource", "test_resource"),
+            ("123resource", "resource_123resource"),
+            ("Test Resource", "test_resource"),
+            ("", ""),
+        ],
+    )
+    def test_sanitize_name(self, generator, raw, expected):
         """Test name sanitization for Terraform."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
+        assert generator._sanitize_name(raw) == expected
 
-            # Test various name sanitizations
-            assert generator._sanitize_name("test-resource") == "test-resource"
-            assert generator._sanitize_name("test.resource") == "test_resource"
-            assert generator._sanitize_name("123resource") == "resource_123resource"
-            assert generator._sanitize_name("Test Resource") == "test_resource"
-            assert generator._sanitize_name("") == ""
-
-    def test_format_tags(self):
+    def test_format_tags(self, generator):
         """Test tag formatting for Terraform."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
-
-            tags = [
-                {"Key": "Name", "Value": "test-instance"},
-                {"Key": "Environment", "Value": "production"},
-                {"Key": "Project:Name", "Value": "test-project"},
-            ]
+        tags = [
+            {"Key": "Name", "Value": "test-instance"},
+            {"Key": "Environment", "Value": "production"},
+            {"Key": "Project:Name", "Value": "test-project"},
+        ]
 
-            result = generator._format_tags(tags)
+        result = generator._format_tags(tags)
 
-            assert 'Name = "test-instance"' in result
-            assert 'Environment = "production"' in result
-            assert '"Project:Name" = "test-project"' in result
+        expected = ('Name = "test-instance"', 'Environment = "production"', '"Project:Name" = "test-project"')
+        missing = [s for s in expected if s not in result]
+        assert not missing, missing
 
-    def test_format_list(self):
+    def test_format_list(self, generator):
         """Test list formatting for Terraform."""
-        with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-            generator = TerraformGenerator()
-
-            # Test with items
-            items = ["item1", "item2", "item3"]
-            result = generator._format_list(items)
-            assert result == '["item1", "item2", "item3"]'
+        # Test with items
+        items = ["item1", "item2", "item3"]
+        result = generator._format_list(items)
+        assert result == '["item1", "item2", "item3"]'
 
-            # Test with empty list
-            result = generator._format_list([])
-            assert result == "[]"
+        # Test with empty list
+        result = generator._format_list([])
+        assert result == "[]"
 
-            # Test with None
-            result = generator._format_list(None)
-            assert result == "[]"
+        # Test with None
+        result = generator._format_list(None)
+        assert result == "[]"
 
-    def test_generate_all_configurations(self):
+    def test_generate_all_configurations(self, generator, monkeypatch):
         """Test generating all configurations."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator(temp_dir)
-
-                with patch.object(generator, "generate_main_tf"):
-                    with patch.object(generator, "generate_variables_tf"):
-                        with patch.object(generator, "generate_outputs_tf"):
-                            with patch.object(generator, "generate_providers_tf"):
-                                with patch.object(generator, "generate_region_configurations"):
-                                    with patch.object(generator, "generate_ec2_resources"):
-                                        with patch.object(generator, "generate_vpc_resources"):
-                                            with patch.object(generator, "generate_route53_resources"):
-                                                with patch.object(generator, "generate_s3_resources"):
-                                                    with patch.object(
-                                                        generator,
-                                                        "generate_iam_resources",
-                                                    ):
-                                                        with patch.object(
-                                                            generator,
-                                                            "generate_modules",
-                                                        ):
-                                                            generator.generate_all_configurations()
-
-                                                            # All methods should have been called
-                                                            generator.generate_main_tf.assert_called_once()
-                                                            generator.generate_variables_tf.assert_called_once()
-                                                            generator.generate_outputs_tf.assert_called_once()
-                                                            generator.generate_providers_tf.assert_called_once()
-
-    def test_generate_modules(self):
+        steps = {name: Mock() for name in _GENERATION_STEPS}
+        for name, step in steps.items():
+            monkeypatch.setattr(generator, name, step)
+
+        generator.generate_all_configurations()
+
+        # All methods should have been called
+        not_called_once = [name for name, step in steps.items() if step.call_count != 1]
+        assert not not_called_once, not_called_once
+
+    def test_generate_modules(self, generator):
         """Test module generation."""
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with patch.object(TerraformGenerator, "_load_all_discovered_resources", return_value={}):
-                generator = TerraformGenerator(temp_dir)
-                generator.generate_modules()
-
-                module_file = os.path.join(temp_dir, "modules", "example.tf")
-                assert os.path.exists(module_file)
-
-                with open(module_file, "r") as f:
-                    content = f.read()
-                    assert 'variable "environment"' in content
-                    assert 'variable "project_name"' in content
-                    assert 'output "module_output"' in content
+        generator.generate_modules()
+
+        module_file = os.path.join(generator.output_dir, "modules", "example.tf")
+        assert os.path.exists(module_file)
+
+        with open(module_file, "r") as f:
+            content = f.read()
+            expected = ('variable "environment"', 'variable "project_name"', 'output "module_output"')
+            missing = [s for s in expected if s not in content]
+            assert not missing, missing
 
 
 if __name__ == "__main__":